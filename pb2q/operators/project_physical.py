@@ -120,17 +120,8 @@ def project_physical_op(op: Expr, **options) -> tuple[Expr, int, int, int]:
         LOG.debug('op is a null product')
         return S.Zero, npart, npart, nsymm
 
-    if not all(isinstance(part_op, (Projection, ParticleOuterProduct)) for part_op in op.args):
-        raise ValueError(f'Cannot resolve physical-space projection for {op}')
-
-    occupancy_right = [(isinstance(part_op, PresenceProjection)
-                        or (isinstance(part_op, ParticleOuterProduct)
-                            and not part_op.bra.is_null_state))
-                       for part_op in op.args]
-    occupancy_left = [(isinstance(part_op, PresenceProjection)
-                      or (isinstance(part_op, ParticleOuterProduct)
-                          and not part_op.ket.is_null_state))
-                      for part_op in op.args]
+    # Validate and compute the occupancies in a single pass over the particle ops
+    occupancy_right, occupancy_left = zip(*(_occupancy(part_op, op) for part_op in op.args))
     LOG.debug('Occupancy right: %s left: %s', occupancy_right, occupancy_left)
 
     try:
@@ -161,3 +152,13 @@ def project_physical_op(op: Expr, **options) -> tuple[Expr, int, int, int]:
     LOG.debug('Returning op=%s, nocc_right=%d, nocc_left=%d, nsymm=%s', op, nocc_right, nocc_left,
               nsymm)
     return op, nocc_right, nocc_left, nsymm
+
+
+def _occupancy(part_op: Expr, op: Expr) -> tuple[bool, bool]:
+    """Return whether the particle is present on the right and on the left of a particle op."""
+    if isinstance(part_op, ParticleOuterProduct):
+        return not part_op.bra.is_null_state, not part_op.ket.is_null_state
+    if isinstance(part_op, Projection):
+        present = isinstance(part_op, PresenceProjection)
+        return present, present
+    raise ValueError(f'Cannot resolve physical-space projection for {op}')
@@ -1,8 +1,8 @@
-# pylint: disable=consider-using-f-string, invalid-name, unused-argument
+# pylint: disable=consider-using-f-string, invalid-name, unused-argument, unidiomatic-typecheck
 """Field register swaps and symmetrizations."""
 from collections.abc import Sequence
 from typing import Any, Union
-from sympy import Add, Expr, factorial, sqrt, sympify
+from sympy import Add, Expr, Integer, default_sort_key, factorial, sqrt, sympify
 from sympy.physics.quantum import HermitianOperator, IdentityOperator, UnitaryOperator
 from sympy.printing.pretty.stringpict import prettyForm
 
@@ -16,14 +16,26 @@ class ParticlePermutation(HermitianOperator, UnitaryOperator):
     Arguments of this operator must be unique contiguous integers >= 0. i'th particle of the
     returned state will correspond to the particle numbered permutation[i] of the input.
     """
+    # Plain-int copy of the permutation, set in __new__
+    _indices: tuple[int, ...]
+
     def __new__(cls, *args, **kwargs):
-        args = sympify(args)
+        if all(type(arg) is int for arg in args):
+            # Plain ints (e.g. from from_swaps) need no general sympification, and the identity
+            # permutation can be recognized before the set-based validation
+            if args == tuple(range(len(args))):
+                return IdentityOperator()
+            args = tuple(map(Integer, args))
+        else:
+            args = sympify(args)
         if not (all(arg.is_integer for arg in args) and set(args) == set(range(len(args)))):
             raise ValueError('ParticlePermutation requires a sequence of unique integers')
         if args == tuple(range(len(args))):
             return IdentityOperator()
 
-        return super().__new__(cls, *args, **kwargs)
+        obj = super().__new__(cls, *args, **kwargs)
+        obj._indices = tuple(int(arg) for arg in args)
+        return obj
 
     @classmethod
     def default_args(cls):
@@ -50,6 +62,37 @@ class ParticlePermutation(HermitianOperator, UnitaryOperator):
             ','.join(f'{arg}' for arg in self.args)
         )
 
+    @classmethod
+    def from_swaps(cls, *ops: Union['ParticleSwap', 'ParticlePermutation']) -> Expr:
+        """Compose a product of ParticleSwaps and ParticlePermutations into one permutation.
+
+        Args:
+            ops: Factors of the product in the order of multiplication (the rightmost acts first).
+
+        Composing the factors agrees with applying them to a state one at a time:
+
+        >>> from pb2q.sympy import apply_op
+        >>> from pb2q.states import FieldKet, ParticleKet
+        >>> ket = FieldKet(*(ParticleKet((i,), (1,)) for i in range(3)))
+        >>> swap, perm1, perm2 = (ParticleSwap(0, 2), ParticlePermutation(1, 2, 0),
+        ...                       ParticlePermutation(1, 0, 2))
+        >>> all(apply_op(op1 * op2 * ket) == apply_op(op1 * apply_op(op2 * ket))
+        ...     for op1, op2 in [(swap, perm1), (perm1, swap), (perm1, perm2)])
+        True
+        """
+        max_arg = max(index for op in ops for index in op.args)
+        state = list(range(max_arg + 1))
+        for op in reversed(ops):
+            if isinstance(op, ParticleSwap):
+                index1, index2 = op.args
+                state[index1], state[index2] = state[index2], state[index1]
+            else:
+                state[:len(op.args)] = [state[i] for i in op._indices]
+        if state == list(range(len(state))):
+            # The factors cancel out
+            return IdentityOperator()
+        return cls(*state)
+
     @staticmethod
     def order_particles(
         state: Union[FieldState, FieldOperator],
@@ -61,30 +104,38 @@ class ParticlePermutation(HermitianOperator, UnitaryOperator):
             permutation: Sequence of integers specifying the permutation. i'th particle of the
                 returned state will correspond to the particle numbered permutation[i] of the input.
         """
-        np = len(permutation)
-        particle_states = [state.args[permutation[i]] for i in range(np)] + list(state.args[np:])
-        return state.func(*particle_states)
+        args = state.args
+        return state.func(*map(args.__getitem__, permutation), *args[len(permutation):])
 
     def _apply_operator_FieldKet(self, rhs: FieldKet, **options) -> Expr:
-        return self.order_particles(rhs, self.args)  # pylint: disable=no-value-for-parameter
+        return self.order_particles(rhs, self._indices)  # pylint: disable=no-value-for-parameter
 
     def _apply_operator_ParticlePermutation(self, rhs: 'ParticlePermutation', **options) -> Expr:
-        new_indices = [rhs_arg[self_arg] for self_arg, rhs_arg in zip(self.args, rhs.args)]
-        return ParticlePermutation(*new_indices)
+        return self.from_swaps(self, rhs)
+
+    def _apply_operator_ParticleSwap(self, rhs: 'ParticleSwap', **options) -> Expr:
+        return self.from_swaps(self, rhs)
 
     def _apply_from_right_to(self, lhs: Expr, **options) -> Expr:
         if isinstance(lhs, FieldBra):
-            return self.order_particles(lhs, self.args)
+            return self.order_particles(lhs, self._indices)
         return None
 
 
 class ParticleSwap(HermitianOperator, UnitaryOperator):
     """Particle-level swap operator implemented as a sympy Operator."""
     def __new__(cls, index1, index2, **kwargs):
-        args = sympify((index1, index2))
-        if not all(arg.is_integer for arg in args):
-            raise ValueError('ParticleSwap requires two integer arguments (index1, index2), got'
-                             f' {args}')
+        if type(index1) is int and type(index2) is int:
+            # Plain ints need neither the general sympification nor the integer check
+            args = (Integer(index1), Integer(index2))
+        else:
+            args = sympify((index1, index2))
+            if not all(arg.is_integer for arg in args):
+                raise ValueError('ParticleSwap requires two integer arguments (index1, index2),'
+                                 f' got {args}')
+        # PSWAP(i,j) and PSWAP(j,i) are the same operator; fix the order so that they are also the
+        # same sympy object (equal hashes, cancellation in Mul and Add)
+        args = tuple(sorted(args, key=default_sort_key))
         return super().__new__(cls, *args, **kwargs)
 
     @classmethod
@@ -123,13 +174,13 @@ class ParticleSwap(HermitianOperator, UnitaryOperator):
         return self.swap_particles(rhs, self.args[0], self.args[1])
 
     def _apply_operator_ParticleSwap(self, rhs: 'ParticleSwap', **options) -> Expr:
-        if set(rhs.args) == set(self.args):
-            # Note that case rhs.args == self.args is actually covered by _eval_power
+        if rhs.args == self.args:
+            # Note that this case is normally covered by _eval_power
             return IdentityOperator()
-        indices = list(range(max(rhs.args + self.args) + 1))
-        indices[rhs.args[0]], indices[rhs.args[1]] = indices[rhs.args[1]], indices[rhs.args[0]]
-        indices[self.args[0]], indices[self.args[1]] = indices[self.args[1]], indices[self.args[0]]
-        return ParticlePermutation(*indices)
+        return ParticlePermutation.from_swaps(self, rhs)
+
+    def _apply_operator_ParticlePermutation(self, rhs: ParticlePermutation, **options) -> Expr:
+        return ParticlePermutation.from_swaps(self, rhs)
 
     def _apply_from_right_to(self, lhs: Expr, **options) -> Expr:
         if isinstance(lhs, FieldBra):
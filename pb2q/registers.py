@@ -3,7 +3,7 @@
 from abc import ABC, abstractmethod
 from collections.abc import Iterable
 from typing import Optional, Union
-from sympy import Add, Expr, S, factorial
+from sympy import Add, Expr, factorial
 from sympy.physics.quantum import Dagger, Ket, IdentityOperator, Operator
 from .field import FieldDefinition
 from .operators import (PresenceProjection, AbsenceProjection, FieldOperator, StepAntisymmetrizer,
@@ -126,16 +126,16 @@ class Field(CompoundRegister):
         if (np := len(particle_args)) > self.max_particles:
             raise ValueError('Too many particle state arguments')
 
-        result = S.Zero
+        terms = []
         for ip, perm in enumerate(generate_perm(range(np))):
             particle_states = [self.particle.state(*particle_args[idx]) for idx in perm]
             particle_states += [self.particle.null_state() for _ in range(self.max_particles - np)]
             ket = FieldKet(*particle_states)
             if self.spin.spin % 2 != 0 and ip % 2 == 1:
                 ket *= -1
-            result += ket
+            terms.append(ket)
 
-        return result / factorial(np)
+        return Add(*terms) / factorial(np)
 
     def null_state(self) -> Expr:
         return FieldKet(*[self.particle.null_state() for _ in range(self.max_particles)])
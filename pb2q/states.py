@@ -258,7 +258,7 @@ class QNumberState(ProductState):
     _label_separator = ';'
 
     def __new__(cls, *args):
-        comp_cls = cls.component_class()
+        comp_cls = cls._component_class()
         statified = []
         for arg in args:
             # pylint: disable-next=isinstance-second-argument-not-valid-type
@@ -3,27 +3,141 @@
 import logging
 from sympy import Number
 from sympy.core.add import Add
+from sympy.core.cache import cacheit
 from sympy.core.mul import Mul
 from sympy.core.power import Pow
 from sympy.core.singleton import S
 from sympy.core.sympify import sympify
+from sympy.core.traversal import preorder_traversal
 
 from sympy.physics.quantum.anticommutator import AntiCommutator
 from sympy.physics.quantum.commutator import Commutator
 from sympy.physics.quantum.dagger import Dagger
 from sympy.physics.quantum.innerproduct import InnerProduct
-from sympy.physics.quantum.operator import OuterProduct, Operator
+from sympy.physics.quantum.operator import OuterProduct, Operator, UnitaryOperator
 from sympy.physics.quantum.state import State, KetBase, BraBase
 from sympy.physics.quantum.tensorproduct import TensorProduct
 
 LOG = logging.getLogger('apply_op')
 
+# Expression classes that apply_op treats differently, in the order of precedence
+_DISPATCH_TYPES = (KetBase, Add, TensorProduct, Pow, Mul)
+
+
+@cacheit
+def _dispatch_type(cls):
+    """Return the first entry of _DISPATCH_TYPES that cls is a subclass of, or None.
+
+    The MRO walk is done once per concrete class and cached.
+    """
+    return next((base for base in _DISPATCH_TYPES if issubclass(cls, base)), None)
+
+
+# Options that only carry debug information and do not affect the results
+_DEBUG_OPTIONS = ('rec_depth', 'rec_depth_mul')
+
+
+def _options_key(options):
+    """Return the options as a hashable memoization key, without the debug counters.
+
+    Returns None when debug logging is enabled, in which case calls are not memoized so that the
+    log shows the full recursion with its depth counters.
+    """
+    if LOG.isEnabledFor(logging.DEBUG):
+        return None
+    return tuple(sorted((k, v) for k, v in options.items() if k not in _DEBUG_OPTIONS))
+
+
+def _mul_raw(*args, is_commutative=None):
+    """Build a Mul from args that are already in canonical order, skipping Mul.flatten.
+
+    Pass is_commutative when it is known, so that it is not recomputed from the args.
+    """
+    return Mul._from_args(args, is_commutative)
+
+
+# Types of tensor product components that apply_op_Mul multiplies pairwise
+_ALLOWED_TP_TYPES = (Operator, State, Mul, Pow)
+
+
+def _tp_args_ok(tp):
+    """Return True if all components of tp are of _ALLOWED_TP_TYPES or unity."""
+    return all(isinstance(arg, _ALLOWED_TP_TYPES) or arg is S.One for arg in tp.args)
+
+
+def _may_apply_operator(lhs, rhs):
+    """Return False if lhs._apply_operator(rhs) would certainly raise.
+
+    The stock Operator._apply_operator only dispatches to _apply_operator_<class name of rhs>, so
+    the presence of the handler can be checked without making the call.
+    """
+    method = getattr(type(lhs), '_apply_operator', None)
+    if method is Operator._apply_operator:
+        return hasattr(lhs, f'_apply_operator_{type(rhs).__name__}')
+    return method is not None
+
+
+@cacheit
+def _args_cnc(e):
+    """Cached e.args_cnc(), returned as tuples.
+
+    Mul instances cannot be weakly referenced, so this goes through the sympy cache (keyed on the
+    expression hash) instead of a per-instance weak mapping.
+    """
+    c_part, nc_part = e.args_cnc()
+    return tuple(c_part), tuple(nc_part)
+
+
+def _needs_expand(e):
+    """Return False if e.expand(commutator=True, tensorproduct=True) would leave e unchanged.
+
+    The expansion distributes products over sums, evaluates (anti)commutators and, through the
+    power_base hint, multiplies out powers of non-commutative bases such as (A*B)**2.
+    """
+    return any(isinstance(node, (Add, Commutator, AntiCommutator))
+               or (isinstance(node, Pow) and not node.base.is_commutative)
+               for node in preorder_traversal(e))
+
+
+@cacheit
+def _dagger(e):
+    """Cached Dagger(e). Dagger of an unevaluated Dagger returns its argument without a rebuild."""
+    if isinstance(e, Dagger):
+        return e.args[0]
+    return Dagger(e)
+
+
+@cacheit
+def _expand_tp(results):
+    """TensorProduct of the tuple of component results, expanded over sums."""
+    return TensorProduct(*results).expand(tensorproduct=True)
+
 
 def apply_op(e, **options):
     """Apply product operators to states.
 
-    See the docstring of qapply for details.
+    See the docstring of qapply for details. Results are memoized through the sympy cache on the
+    expression and the options, as sub-expressions recur across the branches of an expanded
+    expression.
     """
+    return _apply_op_memoized(e, options, False)
+
+
+def _apply_op_memoized(e, options, expanded):
+    """Memoizing wrapper of _apply_op. Set expanded if e is known to be expanded already."""
+    if isinstance(e, (int, float)):
+        return sympify(e)
+    if (key := _options_key(options)) is None:
+        return _apply_op(e, expanded, **options)
+    return _apply_op_cached(e, expanded, key)
+
+
+@cacheit
+def _apply_op_cached(e, expanded, options_key):
+    return _apply_op(e, expanded, **dict(options_key))
+
+
+def _apply_op(e, expanded, **options):
     rec_depth = options.get('rec_depth', 0)
     options['rec_depth'] = rec_depth + 1
 
@@ -39,47 +153,55 @@ def apply_op(e, **options):
     # TensorProducts. The only problem with this is that if we can't apply
     # all the Operators, we have just expanded everything.
     # TODO: don't expand the scalars in front of each Mul.
-    e = e.expand(commutator=True, tensorproduct=True)
+    # Arguments of an expanded expression are themselves expanded, so the recursions into Add,
+    # TensorProduct and Pow arguments below skip this step.
+    # Skip the rebuild when the expansion would be a no-op.
+    if not expanded and _needs_expand(e):
+        e = e.expand(commutator=True, tensorproduct=True)
+    dispatch_type = _dispatch_type(type(e))
 
     # If we just have a raw ket, return it.
-    if isinstance(e, KetBase):
+    if dispatch_type is KetBase:
         return e
 
     # We have an Add(a, b, c, ...) and compute
     # Add(qapply(a), qapply(b), ...)
-    if isinstance(e, Add):
+    if dispatch_type is Add:
         LOG.debug('%d: %s is Add', rec_depth, e)
-        terms = []
-        for arg in e.args:
-            term = apply_op(arg, **options)
-            LOG.debug('%d: Got term %s', rec_depth, term)
-            terms.append(term)
+        terms = [_apply_op_memoized(arg, options, True) for arg in e.args]
+        LOG.debug('%d: Got terms %s', rec_depth, terms)
         return Add(*terms).expand()
 
     # For a raw TensorProduct, call qapply on its args.
-    if isinstance(e, TensorProduct):
-        return e.func(*[apply_op(t, **options) for t in e.args])
+    if dispatch_type is TensorProduct:
+        return e.func(*[_apply_op_memoized(t, options, True) for t in e.args])
 
     # For a Pow, call qapply on its base.
-    if isinstance(e, Pow):
-        return apply_op(e.base, **options) ** e.exp
+    if dispatch_type is Pow:
+        return _apply_op_memoized(e.base, options, True) ** e.exp
 
     # We have a Mul where there might be actual operators to apply to kets.
-    while isinstance(e, Mul):
-        c_part, nc_part = e.args_cnc()
-        c_mul = Mul(*c_part)
-        nc_mul = Mul(*nc_part)
+    while dispatch_type is Mul:
+        # Mul args are canonically ordered with the commutative factors first. Split at the first
+        # non-commutative factor and build both parts without re-canonicalizing them.
+        isplit = next((i for i, arg in enumerate(e.args) if not arg.is_commutative), len(e.args))
+        c_mul = _mul_raw(*e.args[:isplit], is_commutative=True)
+        nc_mul = _mul_raw(*e.args[isplit:], is_commutative=False)
         LOG.debug('%d: %s is Mul, nc_mul=%s', rec_depth, e, nc_mul)
         if isinstance(nc_mul, Mul):
-            result = c_mul * apply_op_Mul(nc_mul, **dict(options))
+            result = apply_op_Mul(nc_mul, **options)
         else:
-            result = c_mul * apply_op(nc_mul, **options)
+            result = apply_op(nc_mul, **options)
+        # Without commutative factors c_mul is S.One; skip the multiplication
+        if isplit != 0:
+            result = c_mul * result
         if result == e:
             if dagger:
-                return Dagger(apply_op_Mul(Dagger(e), **dict(options)))
+                return _dagger(apply_op_Mul(_dagger(e), **options))
             break
         LOG.debug('%d: Updating e to %s', rec_depth, result)
         e = result
+        dispatch_type = _dispatch_type(type(e))
 
     # In all other cases (State, Operator, Pow, Commutator, InnerProduct,
     # OuterProduct) we won't ever have operators to apply to kets.
@@ -87,112 +209,210 @@ def apply_op(e, **options):
 
 
 def apply_op_Mul(e, **options):
+    """Apply the operators in a non-commutative Mul to each other and to states, from the right.
+
+    Results are memoized like those of apply_op.
+    """
+    if (key := _options_key(options)) is None:
+        return _apply_op_Mul(e, **options)
+    return _apply_op_Mul_cached(e, key)
+
+
+@cacheit
+def _apply_op_Mul_cached(e, options_key):
+    return _apply_op_Mul(e, **dict(options_key))
+
+
+def _apply_op_Mul(e, **options):
+    # Factors that could not be applied to anything are peeled off the right end of the Mul one at
+    # a time; collect them here instead of recursing once per peeled factor.
+    peeled = []
+    while True:
+        e, rhs = _apply_op_Mul_step(e, options)
+        if rhs is None:
+            break
+        peeled.append(rhs)
+
+    if not peeled:
+        return e
+    return Mul(e, *reversed(peeled))
+
+
+def _apply_op_Mul_step(e, options):
+    """Reduce a Mul by one step.
+
+    Returns (result, None) when e is fully reduced, or (remaining, rhs) when the right-most factor
+    rhs could not be applied to anything and the reduction should continue with remaining.
+    """
     rec_depth = options.get('rec_depth', 0)
     rec_depth_mul = options.get('rec_depth_mul', 0)
     options['rec_depth_mul'] = rec_depth_mul + 1
     LOG.debug('%d-%d: apply_op_Mul(%s)', rec_depth, rec_depth_mul, e)
     ip_doit = options.get('ip_doit', True)
 
-    args = list(e.args)
-
     # If we only have 0 or 1 args, we have nothing to do and return.
-    if len(args) <= 1 or not isinstance(e, Mul):
-        return e
+    if len(e.args) <= 1 or not isinstance(e, Mul):
+        return e, None
 
-    rhs = args.pop()
-    lhs = args.pop()
+    # Factors to the left of lhs, kept as a tuple slice of e.args
+    args = e.args[:-2]
+    lhs, rhs = e.args[-2:]
 
-    # Make sure we have two non-commutative objects before proceeding.
-    if sympify(rhs).is_commutative or sympify(lhs).is_commutative:
-        return e
+    # Make sure we have two non-commutative objects before proceeding. Both come from Mul.args, so
+    # they are already sympy objects.
+    if rhs.is_commutative or lhs.is_commutative:
+        return e, None
 
     # For a Pow with an integer exponent, apply one of them and reduce the
     # exponent by one.
     if isinstance(lhs, Pow) and lhs.exp.is_Integer:
-        args.append(lhs.base ** (lhs.exp - 1))
+        args += (lhs.base ** (lhs.exp - 1),)
         lhs = lhs.base
 
     # Pull OuterProduct apart
     if isinstance(lhs, OuterProduct):
-        args.append(lhs.ket)
+        args += (lhs.ket,)
         lhs = lhs.bra
 
+    # Unless lhs was rewritten above, args (+ (lhs,)) is a prefix of the canonical e.args and can be
+    # turned back into a Mul without going through Mul.flatten again.
+    mul = _mul_raw if lhs is e.args[-2] else e.func
+
     # Call .doit() on Commutator/AntiCommutator.
     if isinstance(lhs, (Commutator, AntiCommutator)):
         comm = lhs.doit()
         if isinstance(comm, Add):
             return apply_op(
-                e.func(*(args + [comm.args[0], rhs])) +
-                e.func(*(args + [comm.args[1], rhs])),
+                e.func(*args, comm.args[0], rhs) +
+                e.func(*args, comm.args[1], rhs),
                 **options
-            )
-        return apply_op(e.func(*args) * comm * rhs, **options)
+            ), None
+        return apply_op(mul(*args) * comm * rhs, **options), None
 
     # Apply tensor products of operators to states
-    if (isinstance(lhs, TensorProduct)
-            and all(isinstance(arg, (Operator, State, Mul, Pow)) or arg == 1 for arg in lhs.args)
-            and isinstance(rhs, TensorProduct)
-            and all(isinstance(arg, (Operator, State, Mul, Pow)) or arg == 1 for arg in rhs.args)
-            and len(lhs.args) == len(rhs.args)):
-        LOG.debug('%d-%d: Found tensor product, lhs=%s, rhs=%s', rec_depth, rec_depth_mul, lhs.args,
-                  rhs.args)
-        results = []
-        for lhs_arg, rhs_arg in zip(lhs.args, rhs.args):
-            res = apply_op(Mul(lhs_arg, rhs_arg), **options)
-            if res == 0:
-                LOG.debug('%d-%d: Null product of %s', rec_depth, rec_depth_mul, results)
-                return S.Zero
-            results.append(res)
-
-        if all(isinstance(res, Number) for res in results):
-            result = Mul(*results)
-        else:
-            tps = TensorProduct(*results).expand(tensorproduct=True)
-            if isinstance(tps, Add):
-                result = S.Zero
-                for term in tps.args:
-                    c_part, nc_part = term.args_cnc()
-                    result += Mul(*c_part) * rhs.func(*nc_part)
-            else:
-                result = rhs.func(*results)
+    if (isinstance(lhs, TensorProduct) and isinstance(rhs, TensorProduct)
+            and len(lhs.args) == len(rhs.args)
+            and _tp_args_ok(lhs) and _tp_args_ok(rhs)):
+        result = _apply_tp(lhs, rhs, options)
+        if result is S.Zero:
+            return S.Zero, None
         LOG.debug('%d-%d: Factoring out TP result %s from remaining %s', rec_depth, rec_depth_mul,
                   result, args)
+        return apply_op(mul(*args) * result, **options), None
 
-        return apply_op(e.func(*args) * result, **options)
+    # Before acting on a ket, fold a run of unitary operators that define composition rules for
+    # each other (e.g. particle swaps and permutations) into a single operator.
+    if isinstance(rhs, KetBase):
+        args, folded = _fold_unitaries(args, lhs, options)
+        if folded is not lhs:
+            lhs = folded
+            mul = e.func
 
     # Now try to actually apply the operator and build an inner product.
-    try:
-        result = lhs._apply_operator(rhs, **options)
+    applied, result = _try_apply(lhs, rhs, options)
+    if applied:
         LOG.debug('%d-%d: Applied %s to %s -> %s', rec_depth, rec_depth_mul, lhs, rhs, result)
-    except (NotImplementedError, AttributeError):
-        try:
-            result = rhs._apply_from_right_to(lhs, **options)
-            LOG.debug('%d-%d: Right-applied %s to %s -> %s', rec_depth, rec_depth_mul, rhs, lhs,
-                      result)
-        except (NotImplementedError, AttributeError):
-            if isinstance(lhs, BraBase) and isinstance(rhs, KetBase):
-                result = InnerProduct(lhs, rhs)
-                if ip_doit:
-                    result = result.doit()
-                LOG.debug('%d-%d: Innerproduct(%s, %s) = %s', rec_depth, rec_depth_mul, lhs, rhs,
-                          result)
-            else:
-                result = None
-                LOG.debug('%d-%d: No action between %s and %s', rec_depth, rec_depth_mul, lhs, rhs)
+    elif isinstance(lhs, BraBase) and isinstance(rhs, KetBase):
+        result = InnerProduct(lhs, rhs)
+        if ip_doit:
+            result = result.doit()
+        LOG.debug('%d-%d: Innerproduct(%s, %s) = %s', rec_depth, rec_depth_mul, lhs, rhs, result)
+    else:
+        LOG.debug('%d-%d: No action between %s and %s', rec_depth, rec_depth_mul, lhs, rhs)
 
     # TODO: I may need to expand before returning the final result.
     if result == 0:
-        return S.Zero
+        return S.Zero, None
     if result is None:
-        if len(args) == 0:
-            # We had two args to begin with so args=[].
+        if not args:
+            # We had two args to begin with so args=().
             LOG.debug('%d-%d: Returning the original expression %s', rec_depth, rec_depth_mul, e)
-            return e
+            return e, None
         LOG.debug('%d-%d: Factoring out rhs %s', rec_depth, rec_depth_mul, rhs)
-        return apply_op_Mul(e.func(*(args + [lhs])), **options) * rhs
+        return mul(*args, lhs), rhs
     if isinstance(result, InnerProduct):
-        return result * apply_op_Mul(e.func(*args), **options)
+        return result * apply_op_Mul(mul(*args), **options), None
     # result is a scalar times a Mul, Add or TensorProduct
     LOG.debug('%d-%d: Factoring out result %s from remaining %s', rec_depth, rec_depth_mul, result,
               args)
-    return apply_op(e.func(*args) * result, **options)
+    return apply_op(mul(*args) * result, **options), None
+
+
+def _try_apply(lhs, rhs, options):
+    """Apply lhs to rhs through lhs._apply_operator or rhs._apply_from_right_to.
+
+    Returns (applied, result), with applied False if neither handler exists or accepts the pair.
+    Calls that would only raise because the handler does not exist are skipped.
+    """
+    if _may_apply_operator(lhs, rhs):
+        try:
+            return True, lhs._apply_operator(rhs, **options)
+        except (NotImplementedError, AttributeError):
+            pass
+    if hasattr(rhs, '_apply_from_right_to'):
+        try:
+            return True, rhs._apply_from_right_to(lhs, **options)
+        except (NotImplementedError, AttributeError):
+            pass
+    return False, None
+
+
+def _apply_tp(lhs, rhs, options):
+    """Apply a tensor product of operators to a tensor product of states component-wise.
+
+    Returns S.Zero if any component product vanishes.
+    """
+    rec_depth = options.get('rec_depth', 0)
+    rec_depth_mul = options.get('rec_depth_mul', 0)
+    LOG.debug('%d-%d: Found tensor product, lhs=%s, rhs=%s', rec_depth, rec_depth_mul, lhs.args,
+              rhs.args)
+    results = []
+    for lhs_arg, rhs_arg in zip(lhs.args, rhs.args):
+        res = None
+        if (isinstance(lhs_arg, Operator) and not isinstance(lhs_arg, TensorProduct)
+                and isinstance(rhs_arg, KetBase)):
+            # Leaf case: try the operator on the ket directly instead of building a Mul and going
+            # through the full expand-and-split machinery
+            _, res = _try_apply(lhs_arg, rhs_arg, options)
+            if res is not None and res != 0:
+                res = apply_op(res, **options)
+        if res is None:
+            res = apply_op(Mul(lhs_arg, rhs_arg), **options)
+        if res == 0:
+            LOG.debug('%d-%d: Null product of %s', rec_depth, rec_depth_mul, results)
+            return S.Zero
+        results.append(res)
+
+    if all(isinstance(res, Number) for res in results):
+        return Mul(*results)
+    if len(results) == 1 and isinstance(results[0], KetBase):
+        # Single-component product mapped to a single state: nothing to distribute
+        return rhs.func(results[0])
+    tps = _expand_tp(tuple(results))
+    if isinstance(tps, Add):
+        terms = []
+        for term in tps.args:
+            c_part, nc_part = _args_cnc(term)
+            terms.append(Mul(*c_part) * rhs.func(*nc_part))
+        return Add(*terms)
+    return rhs.func(*results)
+
+
+def _fold_unitaries(args, lhs, options):
+    """Fold a run of unitary operators ending in lhs into a single operator.
+
+    Unitary operators that define composition rules for each other (e.g. particle swaps and
+    permutations) are multiplied out from the right end of args. Returns the remaining args and the
+    folded operator, which is lhs itself if nothing was folded.
+    """
+    while (args and isinstance(lhs, UnitaryOperator) and isinstance(args[-1], UnitaryOperator)
+           and hasattr(args[-1], f'_apply_operator_{type(lhs).__name__}')):
+        # The handler may still decline (return None), in which case dispatch raises
+        try:
+            lhs = args[-1]._apply_operator(lhs, **options)
+        except (NotImplementedError, AttributeError):
+            break
+        args = args[:-1]
+        LOG.debug('%d-%d: Folded unitary run into %s', options.get('rec_depth', 0),
+                  options.get('rec_depth_mul', 0), lhs)
+    return args, lhs
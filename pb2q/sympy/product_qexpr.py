@@ -1,47 +1,61 @@
-# pylint: disable=invalid-name, isinstance-second-argument-not-valid-type
+# pylint: disable=invalid-name, isinstance-second-argument-not-valid-type, unidiomatic-typecheck
 """QExpr that are also TensorProducts of component objects."""
-from sympy import Add, Mul, S, sympify
+from operator import methodcaller
+from weakref import WeakValueDictionary
+from sympy import Add, Basic, Mul, Number, S, sympify
+from sympy.core.cache import cacheit
 from sympy.physics.quantum import Dagger, TensorProduct
 from sympy.physics.quantum.qexpr import QExpr
 
+# Live product objects keyed by (class, args). The objects are immutable, so a construction with the
+# same arguments can return the existing instance instead of validating and building a new one.
+_instances = WeakValueDictionary()
+
 
 class ProductQExpr(QExpr, TensorProduct):
     """General abstract quantum product state."""
     _op_priority = 20
 
     def __new__(cls, *args):
-        args = sympify(args)
-        if any(arg == 0 for arg in args):
+        if not all(isinstance(arg, Basic) for arg in args):
+            args = sympify(args)
+        # Unhashable args (e.g. lists, which QExpr turns into Tuples) are not interned
+        key = (cls, args)
+        try:
+            return _instances[key]
+        except KeyError:
+            pass
+        except TypeError:
+            key = None
+        if any(isinstance(arg, Number) and arg.is_zero for arg in args):
             return S.Zero
         if not cls._check_components(args):
             raise ValueError(f'{cls.__name__} components must be {cls.component_class().__name__},'
                              f' got {args}')
 
-        return QExpr.__new__(cls, *args)
+        obj = QExpr.__new__(cls, *args)
+        if key is not None:
+            _instances[key] = obj
+        return obj
 
     @classmethod
     def _check_components(cls, args):
-        if (comp_cls := cls.component_class()) is None:
+        if (comp_cls := cls._component_class()) is None:
+            return True
+        # Common case: every arg is exactly a component
+        if all(type(arg) is comp_cls for arg in args):
             return True
 
+        # Each arg is a sum of terms (a non-Add arg being a single term). A term is either a
+        # component or a Mul whose non-commutative factors are all components.
         for arg in args:
-            if isinstance(arg, Add):
-                for term in arg.args:
-                    if isinstance(term, Mul):
-                        _, nc = term.args_cnc()
-                        if not all(isinstance(op, comp_cls) for op in nc):
-                            return False
-                    elif not isinstance(term, comp_cls):
-                        return False
-
-            elif isinstance(arg, Mul):
-                for fact in arg.args:
-                    _, nc = fact.args_cnc()
-                    if not all(isinstance(op, comp_cls) for op in nc):
+            for term in (arg.args if isinstance(arg, Add) else (arg,)):
+                if isinstance(term, Mul):
+                    if not all(isinstance(fact, comp_cls) for fact in term.args
+                               if not fact.is_commutative):
                         return False
-
-            elif not isinstance(arg, comp_cls):
-                return False
+                elif not isinstance(term, comp_cls):
+                    return False
 
         return True
 
@@ -49,30 +63,43 @@ class ProductQExpr(QExpr, TensorProduct):
     def component_class(cls) -> type[QExpr]:
         return None
 
+    @classmethod
+    @cacheit
+    def _component_class(cls) -> type[QExpr]:
+        # component_class() resolved once per class
+        return cls.component_class()
+
     def _eval_adjoint(self):
         return self.func(*[Dagger(arg) for arg in self.args])
 
     def _eval_rewrite(self, rule, args, **hints):
         # Overriding TensorProduct._eval_rewrite which hardcodes TensorProduct construction
-        return self.func(*args).expand(tensorproduct=True)
+        result = self.func(*args)
+        # Expansion only produces new terms from sums
+        if result.has(Add):
+            result = result.expand(tensorproduct=True)
+        return result
 
     def doit(self, **hints):
         # Overriding TensorProduct.doit
-        return self.func(*[item.doit(**hints) for item in self.args])
+        return self.func(*map(methodcaller('doit', **hints), self.args))
 
     def _eval_expand_tensorproduct(self, **hints):
         # Overriding TensorProduct._eval_expand_tensorproduct
+        func = self.func
         add_args = []
         for iarg, arg in enumerate(self.args):
             if isinstance(arg, Add):
+                new_args = list(self.args)
                 for aa in arg.args:
-                    tp = self.func(*(self.args[:iarg] + (aa,) + self.args[iarg + 1:]))
+                    new_args[iarg] = aa
+                    tp = func(*new_args)
                     c_part, nc_part = tp.args_cnc()
                     # Check for TensorProduct object: is the one object in nc_part, if any:
                     # (Note: any other object type to be expanded must be added here)
                     if len(nc_part) == 1 and isinstance(nc_part[0], TensorProduct):
                         nc_part = (nc_part[0]._eval_expand_tensorproduct(), )
-                    add_args.append(Mul(*c_part) * Mul(*nc_part))
+                    add_args.append(Mul(*c_part, *nc_part))
                 break
 
         if add_args:
@@ -1,19 +1,37 @@
-# pylint: disable=invalid-name, isinstance-second-argument-not-valid-type
+# pylint: disable=invalid-name, isinstance-second-argument-not-valid-type, unidiomatic-typecheck
 """States that are also TensorProducts of component system states."""
-from sympy import S
-from sympy.physics.quantum import BraBase, KetBase, Dagger, State, OuterProduct
+from operator import methodcaller
+from sympy import Expr, Mul, S
+from sympy.core.cache import cacheit
+from sympy.physics.quantum import (BraBase, KetBase, Dagger, State, OuterProduct, OrthogonalBra,
+                                   OrthogonalKet)
 from .product_qexpr import ProductQExpr
 
+_adjoint = methodcaller('adjoint')
+
+
+def _component_innerproduct(ket, bra, **hints):
+    """Inner product of product state components.
+
+    Orthogonal basis states with integer labels are resolved by comparing the labels, which is what
+    OrthogonalKet._eval_innerproduct does through symbolic subtraction of each label pair.
+    """
+    if (type(ket) is OrthogonalKet and type(bra) is OrthogonalBra
+            and all(label.is_Integer for label in ket.args + bra.args)
+            and len(ket.args) == len(bra.args)):
+        return S.One if ket.args == bra.args else S.Zero
+    return ket._eval_innerproduct(bra, **hints)
+
 
 class ProductState(State, ProductQExpr):
     """General abstract quantum product state."""
     _op_priority = 20
 
     @property
+    @cacheit
     def dual(self):
         """Return the dual state of this one."""
-        return self.dual_class()._new_rawargs(self.hilbert_space,
-                                              *[arg.adjoint() for arg in self.args])
+        return self.dual_class()._new_rawargs(self.hilbert_space, *map(_adjoint, self.args))
 
 
 class ProductKet(ProductState, KetBase):
@@ -29,18 +47,26 @@ class ProductKet(ProductState, KetBase):
                 raise ValueError('Cannot multiply a product ket that has a different number of'
                                  ' components.')
 
+            # Any orthogonal component makes the whole product vanish, even if the inner products
+            # of other components are undetermined
+            compres_all = []
             for bra_arg, arg in zip(bra.args, self.args):
-                compres = arg._eval_innerproduct(bra_arg, **hints)
-                if compres is None:
-                    return None
+                compres = _component_innerproduct(arg, bra_arg, **hints)
                 if compres == 0:
                     return S.Zero
+                # Orthonormal components give S.One, which need not enter the product
+                if compres is not S.One:
+                    compres_all.append(compres)
 
-            return S.One
+            if any(compres is None for compres in compres_all):
+                return None
+            return Mul(*compres_all)
 
         return super()._eval_innerproduct(bra, **hints)
 
     def __mul__(self, other):
+        if type(other) is self.dual_class():
+            return ProductOuterProduct._new_unchecked(self, other)
         if isinstance(other, ProductBra):
             return ProductOuterProduct(self, other)
         return KetBase.__mul__(self, other)
@@ -61,10 +87,18 @@ class ProductOuterProduct(OuterProduct):
             raise ValueError(f'Invalid argument for ProductOuterProduct {args}')
         return super().__new__(cls, *args, **old_assumptions)
 
+    @classmethod
+    def _new_unchecked(cls, ket, bra):
+        """Construct from a ProductKet and a bra of its dual class, skipping validation."""
+        obj = Expr.__new__(cls, ket, bra)
+        # Same as OuterProduct.__new__; the subclass instance has a __dict__ despite the base slots
+        obj.hilbert_space = ket.hilbert_space  # pylint: disable=assigning-non-slot
+        return obj
+
     def _apply_operator(self, ket, **options):
         if isinstance(ket, ProductKet):
             ip = self.bra * ket
-            if options.get('ip_doit', True):
+            if options.get('ip_doit', True) and not ip.is_Number:
                 ip = ip.doit()
             return ip * self.ket
         return super()._apply_operator(ket, **options)
@@ -72,10 +106,11 @@ class ProductOuterProduct(OuterProduct):
     def _apply_from_right_to(self, bra, **options):  # pylint: disable=unused-argument
         if isinstance(bra, ProductBra):
             ip = bra * self.ket
-            if options.get('ip_doit', True):
+            if options.get('ip_doit', True) and not ip.is_Number:
                 ip = ip.doit()
             return ip * self.bra
         return None
 
+    @cacheit
     def _eval_adjoint(self):
         return self.func(Dagger(self.bra), Dagger(self.ket))